@@ -47,6 +47,12 @@ exports.optionDefinitions = {
     help: "Parameters to pass to behave.",
     defaultValue: undefined,
   },
+  behave_jobs: {
+    help: "The number of behave processes to run in parallel. Each process \
+runs whole feature files.",
+    type: Number,
+    defaultValue: 1,
+  },
   tei: {
     help: "Path to the directory containing the TEI stylesheets.",
     defaultValue: "/usr/share/xml/tei/stylesheet",
@@ -132,6 +132,41 @@ exports.test = sequence("test", lint, testKarma, testKarmaWebpack,
                           }
                         });
 
+// Run the features in ``jobs`` behave processes running in parallel. Each
+// process gets the next feature not yet run, until all features are run.
+function seleniumParallel(features, args, jobs) {
+  const queue = features.slice();
+  let failed = false;
+
+  function worker(id) {
+    const env = Object.assign({}, process.env, { BEHAVE_WORKER: String(id) });
+    return Promise.coroutine(function *runFeatures() {
+      while (queue.length !== 0) {
+        const feature = queue.shift();
+        try {
+          yield spawn("behave", [feature].concat(args),
+                      { stdio: "inherit", env });
+        }
+        catch (ex) {
+          log(`${feature} failed: ${ex.message}`);
+          failed = true;
+        }
+      }
+    })();
+  }
+
+  const workers = [];
+  for (let id = 0; id < Math.min(jobs, features.length); ++id) {
+    workers.push(worker(id));
+  }
+
+  return Promise.all(workers).then(() => {
+    if (failed) {
+      throw new Error("some features failed");
+    }
+  });
+}
+
 // Features is an optional array of features to run instead of running all
 // features.
 function selenium(features) {
@@ -139,7 +174,14 @@ function selenium(features) {
 
   // We check what we obtained from `behave_params` too, just in case someone is
   // trying to select a specific feature though behave_params.
-  if (args.filter(x => /\.feature$/.test(x)).length === 0 && !features) {
+  const selected = args.filter(x => /\.feature$/.test(x)).length !== 0;
+
+  if (!selected && !features && options.behave_jobs > 1) {
+    return seleniumParallel(glob.sync("selenium_test/*.feature"), args,
+                            options.behave_jobs);
+  }
+
+  if (!selected && !features) {
     args.push("selenium_test");
   }
 
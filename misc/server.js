@@ -24,6 +24,7 @@ const serveStatic = require("serve-static");
 const path = require("path");
 const url = require("url");
 const fs = require("fs");
+const fsExtra = require("fs-extra");
 const querystring = require("querystring");
 const crypto = require("crypto");
 const morgan = require("morgan");
@@ -39,6 +40,13 @@ parser.addArgument(["-v", "--verbose"], {
   action: "storeTrue",
 });
 
+parser.addArgument(["--dump-dir"], {
+  help: "The directory in which to store the data posted to the \
+/build/ajax/ paths. Defaults to build/ajax. Servers running concurrently \
+should each use their own directory.",
+  dest: "dumpDir",
+});
+
 parser.addArgument(["address"], {
   nargs: "?",
 });
@@ -51,6 +59,8 @@ if (address) {
   [ip, port] = address.split(":");
 }
 const cwd = process.cwd();
+const dumpDir = args.dumpDir ? path.resolve(args.dumpDir) :
+      path.join(cwd, "build/ajax");
 
 if (args.mode === "browser") {
   args.visible = true;
@@ -64,6 +74,20 @@ const expiration = new Date(Date.now() + (tenYears * 1000)).toUTCString();
 const app = express();
 
 app.use(compression());
+// The files we dump are served from the dump directory, which may not be
+// build/ajax. We do not fall through to the general static server because it
+// could serve a file dumped by another server.
+const serveDumps = serveStatic(dumpDir);
+app.use(makePaths("/build/ajax"), (request, response, next) => {
+  if (request.method !== "GET" && request.method !== "HEAD") {
+    next();
+    return;
+  }
+
+  serveDumps(request, response, () => {
+    response.sendStatus(404);
+  });
+});
 app.use(serveStatic(cwd));
 app.use("/forever", serveStatic(cwd, {
   setHeaders(res) {
@@ -111,7 +135,7 @@ function dumpData(request, options, callback) {
   };
 
   const uri = url.parse(request.url).pathname;
-  const filename = path.join(cwd, uri);
+  const filename = path.join(dumpDir, path.basename(uri));
   const chunks = [];
   request.on("data", (chunk) => {
     chunks.push(chunk.toString());
@@ -218,8 +242,9 @@ function unlinkIfExists(filePath) {
   }
 }
 
-unlinkIfExists(path.join(cwd, "/build/ajax/log.txt"));
-unlinkIfExists(path.join(cwd, "/build/ajax/save.txt"));
+fsExtra.ensureDirSync(dumpDir);
+unlinkIfExists(path.join(dumpDir, "log.txt"));
+unlinkIfExists(path.join(dumpDir, "save.txt"));
 
 runserver();
 
@@ -14,7 +14,7 @@ from requests.exceptions import ConnectionError
 from pyvirtualdisplay import Display
 
 # pylint: disable=E0611
-from nose.tools import assert_true, assert_false
+from nose.tools import assert_true, assert_false, assert_equal
 
 from behave.tag_matcher import ActiveTagMatcher
 from selenic import Builder, outil
@@ -99,10 +99,16 @@ def start_server(context):
     port = str(port)
     context.server_port = port
 
+    args = ["node", "./misc/server.js", "localhost:" + port]
+    if context.worker is not None:
+        # Workers running in parallel must not share the files in which the
+        # server saves the data posted to it.
+        args += ["--dump-dir",
+                 os.path.join("build", "ajax", "worker-" + context.worker)]
+
     def start():
         # Start a server just for our tests...
-        context.server = subprocess.Popen(["node", "./misc/server.js",
-                                           "localhost:" + port])
+        context.server = subprocess.Popen(args)
         # This is the address at which we can control the server
         # locally.
         local_server = "http://localhost:" + port + builder.WED_ROOT
@@ -148,8 +154,12 @@ screenshots_dir_path = os.path.join("test_logs", "screenshots")
 
 def setup_screenshots(context):
     now = datetime.datetime.now().replace(microsecond=0)
-    this_screenshots_dir_path = os.path.join(screenshots_dir_path,
-                                             now.isoformat())
+    name = now.isoformat()
+    if context.worker is not None:
+        # A worker runs one behave process per feature, and two of them
+        # may start within the same second.
+        name += "-worker-{0}-{1}".format(context.worker, os.getpid())
+    this_screenshots_dir_path = os.path.join(screenshots_dir_path, name)
 
     os.makedirs(this_screenshots_dir_path)
     latest = os.path.join(screenshots_dir_path, "LATEST")
@@ -159,8 +169,13 @@ def setup_screenshots(context):
         if ex.errno != 2:
             raise
 
-    os.symlink(os.path.basename(this_screenshots_dir_path),
-               os.path.join(screenshots_dir_path, "LATEST"))
+    try:
+        os.symlink(os.path.basename(this_screenshots_dir_path),
+                   os.path.join(screenshots_dir_path, "LATEST"))
+    except OSError as ex:
+        # Parallel workers race to create the link. Any of them is fine.
+        if ex.errno != 17:
+            raise
     context.screenshots_dir_path = this_screenshots_dir_path
 
 
@@ -175,6 +190,10 @@ class Top(object):
 def before_all(context):
     atexit.register(cleanup, context, True)
 
+    # Show the whole diff when assert_equal fails on long values, like
+    # saved documents. This is set once for the whole run.
+    assert_equal.__self__.maxDiff = None
+
     # We set these to None explicity so that the cleanup code can run
     # through without error. It assumes that these fields exist.
     context.builder = None
@@ -186,11 +205,18 @@ def before_all(context):
     context.tunnel_id = None
 
     context.selenium_quit = os.environ.get("SELENIUM_QUIT")
+    # Set when this process is one of several running the suite in parallel.
+    context.worker = os.environ.get("BEHAVE_WORKER")
     userdata = context.config.userdata
     context.builder = builder = Builder(conf_path, userdata)
     ssh_tunnel = None
     dump_config(builder)
 
+    if builder.remote and context.worker is not None:
+        # The workers would all use the same tunnel settings.
+        raise Exception("running features in parallel is not supported "
+                        "with remote browsers")
+
     setup_screenshots(context)
 
     browser_to_tag_value = {
@@ -249,6 +275,8 @@ def before_all(context):
 
     context.behave_captions = os.environ.get("BEHAVE_CAPTIONS")
 
+    context.script_timings = os.environ.get("BEHAVE_SCRIPT_TIMINGS")
+
     context.selenium_logs = os.environ.get("SELENIUM_LOGS", False)
 
     server_thread.join()
@@ -378,6 +406,10 @@ def before_scenario(context, scenario):
                            context.top.initial_window_size["height"])
     driver.set_window_position(0, 0)
 
+    context.element_cache = {}
+    context.caret_screen_position_recorded = False
+    context.caret_screen_position_fresh = False
+
     context.top.driver_meta.scenarios += 1
 
 
@@ -480,6 +512,12 @@ def after_step(context, step):
         print("Captured screenshot:", name)
         print("")
 
+    # A caret position recorded by a step is reusable only in the step
+    # that immediately follows.
+    context.caret_screen_position_fresh = \
+        context.caret_screen_position_recorded
+    context.caret_screen_position_recorded = False
+
     dump_javascript_log(context)
 
 
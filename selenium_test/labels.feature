@@ -17,7 +17,8 @@ Scenario: Increasing the label visiblity level.
 Scenario: Increasing the label visibility level when a caret is set.
   When the user scrolls the editor pane completely down
   And clicks on the start label of the first "p" element in "body"
-  And hits the right arrow
-  And hits the right arrow
+  And queues hitting the right arrow
+  And queues hitting the right arrow
+  And performs the pending actions
   And increases the label visibility level
   Then the caret is at the same position on the screen.
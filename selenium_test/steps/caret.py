@@ -1,15 +1,19 @@
 from selenium.webdriver.common.action_chains import ActionChains
+from selenium.webdriver.common.actions.action_builder import ActionBuilder
 # pylint: disable=E0611
 from nose.tools import assert_true, assert_equal, assert_not_equal, \
     assert_false
-import selenium.webdriver.support.expected_conditions as EC
 from selenium.webdriver.common.by import By
 from selenium.webdriver.common.keys import Keys
 
 import wedutil
 import selenic.util
 
-from selenium_test.util import get_element_parent_and_parent_text
+from selenium_test.util import get_element_parent_and_parent_text, \
+    caret_selection_pos_pair, label_caret_selection_pos_pair, \
+    find_cached_element, wait_for_caret_screen_pos, element_screen_center, \
+    record_caret_screen_pos, wait_until_no_element, get_selection_state, \
+    run_js, wait, get_text_excluding_children, round_pos
 
 # Don't complain about redefined functions
 # pylint: disable=E0102
@@ -31,29 +35,59 @@ def select_text(context, start, end):
     """
 
     driver = context.driver
-    origin = context.origin_object
 
-    ActionChains(driver)\
-        .move_to_element_with_offset(origin, start["left"], start["top"])\
-        .click_and_hold()\
-        .move_to_element_with_offset(origin, end["left"], end["top"])\
-        .release()\
-        .perform()
+    if driver.w3c:
+        # The origin object is fixed at the top left corner of the
+        # viewport so the coordinates can be used as viewport
+        # coordinates. This saves the driver from fetching the geometry
+        # of the origin object for each move.
+        actions = ActionBuilder(driver)
+        actions.pointer_action\
+            .move_to_location(start["left"], start["top"])\
+            .click_and_hold()\
+            .move_to_location(end["left"], end["top"])\
+            .release()
+        actions.perform()
+    else:
+        origin = context.origin_object
+        ActionChains(driver)\
+            .move_to_element_with_offset(origin, start["left"], start["top"])\
+            .click_and_hold()\
+            .move_to_element_with_offset(origin, end["left"], end["top"])\
+            .release()\
+            .perform()
+
+
+def _fetch_label_state(util, selector):
+    """
+    Finds the element matching ``selector`` and checks whether it is a
+    clicked label. The element is found and its state read in one
+    script, which is polled until the element exists.
+
+    :returns: A triple whose first member is the element, the second
+              member is whether it has the ``_label_clicked`` class, and
+              the third member is the element name in the label.
+    """
+    return wait(util, lambda driver: driver.execute_script("""
+    var button = document.querySelector(arguments[0]);
+    if (!button)
+      return null;
+    return [button, button.classList.contains("_label_clicked"),
+            button.querySelector("._element_name")];
+    """, selector))
 
 
 @when(u"an element's label has been clicked")
 def step_impl(context):
-    context.execute_steps(u"""
-    When the user clicks on an element's label
-    Then the label changes to show it is selected
-    """)
+    # Calling the steps directly saves parsing them with execute_steps.
+    user_clicks_on_label(context, "an element's label")
+    label_is_selected(context)
 
 
 @when(u"the user clicks on text")
 def step_impl(context):
     driver = context.driver
-    util = context.util
-    element = util.find_element((By.CSS_SELECTOR, ".title"))
+    element = find_cached_element(context, ".title")
 
     rect = driver.execute_script("""
     var title = arguments[0];
@@ -94,9 +128,8 @@ def step_impl(context):
 
 @then(ur"the caret is at the last position before the focus was lost\.?")
 def step_impl(context):
-    context.util.wait(lambda driver:
-                      context.caret_screen_position_before_focus_loss ==
-                      wedutil.caret_screen_pos(driver))
+    wait_for_caret_screen_pos(context.util,
+                              context.caret_screen_position_before_focus_loss)
 
 
 @then(u"the selection is the same as before the focus was lost")
@@ -110,34 +143,38 @@ def step_impl(context):
       u"(?P<what>an element's label|the end label of an element|"
       u'the end label of the last paragraph|'
       u'the end label of the first "addrLine" element)')
-def step_impl(context, what):
+def user_clicks_on_label(context, what):
     driver = context.driver
-    util = context.util
 
+    last = False
     if what in ("an element's label", "the end label of an element"):
         selector = ".__end_label._title_label"
     elif what == "the end label of the last paragraph":
-        selector = ".body .__end_label._p_label:last"
+        selector = ".body .__end_label._p_label"
+        last = True
     elif what == 'the end label of the first "addrLine" element':
         selector = ".__end_label._addrLine_label"
     else:
         raise Exception("unknown choice: " + what)
 
     # Faster than using 4 Selenium operations.
-    button, parent, button_class, parent_text = driver.execute_script("""
+    button, parent, already_clicked, parent_text, element_name = \
+        driver.execute_script("""
     var selector = arguments[0];
+    var last = arguments[1];
 
-    var button = jQuery(selector)[0];
+    var buttons = document.querySelectorAll(selector);
+    var button = buttons[last ? buttons.length - 1 : 0];
     var parent = button.parentNode;
-    var parent_text = jQuery(parent).contents().filter(function() {
-       return this.nodeType == Node.TEXT_NODE;
-    }).text();
-    return [button, parent, button.className, parent_text];
-    """, selector)
+    var parent_text = window.__wedTestHelpers.textExcludingChildren(parent);
+    return [button, parent, button.classList.contains("_label_clicked"),
+            parent_text, button.querySelector("._element_name")];
+    """, selector, last)
     context.clicked_element = button
+    context.clicked_element_name = element_name
     context.clicked_element_parent = parent
     context.clicked_element_parent_initial_text = parent_text
-    assert_true("_label_clicked" not in button_class.split())
+    assert_false(already_clicked)
     ActionChains(driver)\
         .click(button)\
         .perform()
@@ -164,28 +201,27 @@ def step_impl(context, what):
       ur'the first "(?P<element>.*?)" element in "body")')
 def step_impl(context, choice, element=None):
     driver = context.driver
-    util = context.util
 
     if choice == "an element":
-        button = util.find_element((By.CSS_SELECTOR,
-                                    ".__start_label._p_label"))
+        selector = ".__start_label._p_label"
     elif element is not None:
         element = element.replace(":", ur"\:")
-        button = util.find_element((By.CSS_SELECTOR,
-                                    ".body .__start_label._" + element +
-                                    "_label"))
+        selector = ".body .__start_label._" + element + "_label"
     else:
         raise ValueError("unexpected choice: " + choice)
 
+    button, already_clicked, element_name = _fetch_label_state(
+        context.util, selector)
     context.clicked_element = button
-    assert_true("_label_clicked" not in button.get_attribute("class").split())
+    context.clicked_element_name = element_name
+    assert_false(already_clicked)
     ActionChains(driver)\
         .click(button)\
         .perform()
 
 
 @then(u'the label changes to show it is selected')
-def step_impl(context):
+def label_is_selected(context):
     button = context.clicked_element
     assert_true("_label_clicked" in button.get_attribute("class").split())
 
@@ -193,8 +229,10 @@ def step_impl(context):
 @then(u'the caret is in the element name in the label')
 def step_impl(context):
     util = context.util
-    button = context.clicked_element
-    en = button.find_element_by_class_name("_element_name")
+    en = context.clicked_element_name
+    if en is None:
+        en = context.clicked_element.find_element_by_class_name(
+            "_element_name")
     wedutil.wait_for_caret_to_be_in(util, en)
 
 _CHOICE_TO_ARROW = {
@@ -208,15 +246,34 @@ _CHOICE_TO_ARROW = {
 def step_impl(context, choice):
     driver = context.driver
 
-    context.caret_position_before_arrow = wedutil.caret_screen_pos(
-        driver)
-
     key = _CHOICE_TO_ARROW[choice]
     ActionChains(driver)\
         .send_keys(key)\
         .perform()
 
 
+def _pending_actions(context):
+    """
+    Gets the actions queued by the steps of the current scenario,
+    creating an empty chain if there is none.
+    """
+    actions = getattr(context, "pending_actions", None)
+    if actions is None:
+        actions = context.pending_actions = ActionChains(context.driver)
+    return actions
+
+
+@when(u"(?:the user )?queues hitting the (?P<choice>right|left|down) arrow")
+def step_impl(context, choice):
+    _pending_actions(context).send_keys(_CHOICE_TO_ARROW[choice])
+
+
+@when(u"(?:the user )?performs the pending actions")
+def step_impl(context):
+    _pending_actions(context).perform()
+    context.pending_actions = None
+
+
 @then(u'the label of the element that has the context menu is selected.?')
 def step_impl(context):
     trigger = context.context_menu_trigger
@@ -225,9 +282,7 @@ def step_impl(context):
 
 @then(u'no label is selected')
 def step_impl(context):
-    util = context.util
-    util.wait_until_not(EC.presence_of_element_located(
-        (By.CLASS_NAME, "_label_clicked")))
+    wait_until_no_element(context.util, "._label_clicked")
 
 
 # This is also our default for when a mechanism is not specified.
@@ -235,28 +290,14 @@ def step_impl(context):
       ur'(?: with the mouse)?\.?')
 def step_impl(context, direction):
     driver = context.driver
-    util = context.util
 
     direction = direction.strip()
 
-    element, parent, parent_text = get_element_parent_and_parent_text(
-        driver, ".__start_label._title_label")
-    element.click()
-    wedutil.wait_for_caret_to_be_in(util, parent)
-
     # From the label to before the first letter and then past the
-    # first letter.
-    ActionChains(driver)\
-        .send_keys(*[Keys.ARROW_RIGHT] * 2)\
-        .perform()
-
-    # We need to get the location of the caret.
-    start = wedutil.caret_selection_pos(driver)
-    # This moves two characters to the right
-    ActionChains(driver)\
-        .send_keys(*[Keys.ARROW_RIGHT] * 2)\
-        .perform()
-    end = wedutil.caret_selection_pos(driver)
+    # first letter. Then we need to get the location of the caret,
+    # move two characters to the right and get the location again.
+    start, end, parent, parent_text = label_caret_selection_pos_pair(
+        driver, ".__start_label._title_label", 2, 2)
 
     if direction == "":
         select_text(context, start, end)
@@ -267,7 +308,7 @@ def step_impl(context, direction):
 
     context.expected_selection = parent_text[1:3]
     context.selection_parent = parent
-    context.caret_screen_position = wedutil.caret_screen_pos(driver)
+    record_caret_screen_pos(context)
 
 
 @when(u'the user selects text(?P<direction>.*?) with the keyboard')
@@ -277,19 +318,17 @@ def step_impl(context, direction):
     util = context.util
 
     if direction == "":
-        keys = (
-            # From the label to before the first letter and then past the
-            # first letter.
-            [Keys.ARROW_RIGHT] * 2 +
-            # This moves two caracters to the right with shift down.
-            [Keys.SHIFT] + [Keys.ARROW_RIGHT] * 2 + [Keys.SHIFT])
+        # From the label to before the first letter and then past the
+        # first letter.
+        move = Keys.ARROW_RIGHT * 2
+        # This moves two caracters to the right with shift down.
+        select = Keys.ARROW_RIGHT * 2
     elif direction == "backwards":
-        keys = (
-            # From the label to before the first letter and then past the
-            # first letter, and then two more to the right.
-            [Keys.ARROW_RIGHT] * (2 + 2) +
-            # This moves two caracters to the left with shift down.
-            [Keys.SHIFT] + [Keys.ARROW_LEFT] * 2 + [Keys.SHIFT])
+        # From the label to before the first letter and then past the
+        # first letter, and then two more to the right.
+        move = Keys.ARROW_RIGHT * (2 + 2)
+        # This moves two caracters to the left with shift down.
+        select = Keys.ARROW_LEFT * 2
     else:
         raise ValueError("unexpected direction: " + direction)
 
@@ -298,10 +337,12 @@ def step_impl(context, direction):
 
     ActionChains(driver)\
         .click(element)\
+        .send_keys(move)\
+        .key_down(Keys.SHIFT)\
+        .send_keys(select)\
+        .key_up(Keys.SHIFT)\
         .perform()
 
-    util.send_keys(element, keys)
-
     assert_true(util.is_something_selected(), "something must be selected")
 
     context.expected_selection = parent_text[1:3]
@@ -312,7 +353,6 @@ def step_impl(context, direction):
       u'the first paragraph in "body")')
 def step_impl(context, what):
     driver = context.driver
-    util = context.util
 
     if what == "an element":
         what = "the first title element"
@@ -329,22 +369,19 @@ def step_impl(context, what):
 
     ActionChains(driver)\
         .click(element) \
+        .send_keys(Keys.ARROW_RIGHT) \
+        .key_down(Keys.SHIFT) \
+        .send_keys(Keys.ARROW_RIGHT * len(parent_text)) \
+        .key_up(Keys.SHIFT) \
         .perform()
 
-    util.send_keys(element,
-                   # From the label to before the first letter.
-                   [Keys.ARROW_RIGHT] +
-                   # This select the whole text of the element.
-                   [Keys.SHIFT] + [Keys.ARROW_RIGHT] * len(parent_text) +
-                   [Keys.SHIFT])
-
-    assert_true(util.is_something_selected(), "something must be selected")
-    text = util.get_selection_text()
+    something_selected, text = get_selection_state(driver)
+    assert_true(something_selected, "something must be selected")
     assert_equal(text, parent_text, "expected selection")
 
     context.expected_selection = text
     context.selection_parent = parent
-    context.caret_screen_position = wedutil.caret_screen_pos(driver)
+    record_caret_screen_pos(context)
 
 
 @when(u'the user selects the whole contents of the first paragraph in '
@@ -353,7 +390,7 @@ def step_impl(context):
     driver = context.driver
     util = context.util
 
-    p = util.find_element((By.CSS_SELECTOR, ".body .p"))
+    p = find_cached_element(context, ".body .p")
 
     text = wedutil.select_contents_directly(util, p)
 
@@ -371,7 +408,7 @@ def step_impl(context):
 
     context.expected_selection = text
     context.selection_parent = p
-    context.caret_screen_position = wedutil.caret_screen_pos(driver)
+    record_caret_screen_pos(context)
 
 
 @when(u'the user selects the "(?P<what>.*?)" of the first title')
@@ -379,10 +416,18 @@ def step_impl(context, what):
     driver = context.driver
     util = context.util
 
-    parent = util.find_element((By.CSS_SELECTOR, ".title"))
-    label = parent.find_element_by_css_selector(".__start_label._title_label")
+    parent = find_cached_element(context, ".title")
 
-    if label.is_displayed():
+    # We need to find the text inside the title element. We get it
+    # along with the label and whether the label is displayed.
+    label, label_displayed, text = driver.execute_script("""
+    var parent = arguments[0];
+    var label = parent.querySelector(".__start_label._title_label");
+    return [label, window.getComputedStyle(label).display !== "none",
+            window.__wedTestHelpers.textExcludingChildren(parent)];
+    """, parent)
+
+    if label_displayed:
         ActionChains(driver) \
             .click(label) \
             .perform()
@@ -392,22 +437,15 @@ def step_impl(context, what):
             .click() \
             .perform()
 
-    # We need to find the text inside the title element
-    text = util.get_text_excluding_children(parent)
     start_index = text.find(what)
     assert_true(start_index >= 0, "should have found the text")
+    before = 0
     if start_index > 0:
-        util.send_keys(parent,
-                       # Move the caret to the start of the selection
-                       # we want.
-                       [Keys.ARROW_RIGHT] * (start_index +
-                                             1 if label.is_displayed() else 0))
+        before = start_index + 1 if label_displayed else 0
 
-    start = wedutil.caret_selection_pos(driver)
-    util.send_keys(parent,
-                   # Move to the end of the selection we want.
-                   [Keys.ARROW_RIGHT] * len(what))
-    end = wedutil.caret_selection_pos(driver)
+    # Move the caret to the start of the selection we want, and then
+    # to the end of the selection we want.
+    start, end = caret_selection_pos_pair(driver, before, len(what))
 
     # We don't want to be too close to the edge to handle a problem when
     # labels are. The problem is that when the labels are invisible they
@@ -431,7 +469,7 @@ def step_impl(context, what):
     assert_equal(util.get_selection_text(), what,
                  "the selected text should be what we wanted to select")
     context.selection_parent = parent
-    context.caret_screen_position = wedutil.caret_screen_pos(driver)
+    record_caret_screen_pos(context)
     context.element_to_test_for_text = parent
 
 
@@ -459,7 +497,8 @@ def step_impl(context):
     parent = context.selection_parent
 
     # It may take a bit.
-    util.wait(lambda *_: not len(util.get_text_excluding_children(parent)))
+    wait(util,
+         lambda driver: not len(get_text_excluding_children(driver, parent)))
 
 
 @then(u'the text is pasted')
@@ -469,7 +508,8 @@ def step_impl(context):
     text = context.expected_selection
 
     # It may take a bit.
-    util.wait(lambda *_: util.get_text_excluding_children(parent) == text)
+    wait(util,
+         lambda driver: get_text_excluding_children(driver, parent) == text)
 
 
 @then(ur"the selection is restored to what it was before the context menu "
@@ -477,8 +517,8 @@ def step_impl(context):
 def step_impl(context):
     util = context.util
 
-    util.wait(lambda *_: util.get_selection_text() ==
-              context.expected_selection)
+    wait(util,
+         lambda *_: util.get_selection_text() == context.expected_selection)
 
 
 @when(ur"the user selects text on (?P<what>an element's label|phantom text)")
@@ -492,7 +532,7 @@ def step_impl(context, what):
     var selector = arguments[0];
     var label = arguments[1];
 
-    var el = jQuery(selector)[0];
+    var el = document.querySelector(selector);
     el.scrollIntoView();
     var text = label ? el.firstChild.firstChild : el.firstChild;
     var range = document.createRange();
@@ -505,6 +545,7 @@ def step_impl(context, what):
     """, selector, label)
 
     context.clicked_element = label
+    context.clicked_element_name = None
 
     select_text(context, start, end)
 
@@ -541,14 +582,7 @@ def step_impl(context):
     p = context.multiline_paragraph
     end_label = p.find_element_by_css_selector(".__end_label._p_label")
     end_label.click()
-    ActionChains(driver) \
-        .send_keys([Keys.ARROW_LEFT]) \
-        .perform()
-    pos = wedutil.caret_selection_pos(driver)
-    ActionChains(driver) \
-        .send_keys([Keys.ARROW_LEFT]) \
-        .perform()
-    pos2 = wedutil.caret_selection_pos(driver)
+    pos, pos2 = caret_selection_pos_pair(driver, 1, 1, "left")
     ActionChains(driver) \
         .move_to_element_with_offset(context.origin_object,
                                      round(pos["left"] + pos2["left"] / 2),
@@ -568,7 +602,7 @@ def step_impl(context):
 
     # Move onto the label
     ActionChains(driver) \
-        .send_keys([Keys.ARROW_RIGHT]) \
+        .send_keys(Keys.ARROW_RIGHT) \
         .perform()
 
     labels = p.find_elements_by_css_selector(
@@ -595,7 +629,7 @@ def step_impl(context):
         driver, ".__start_label._title_label")
 
     # This is where our selection will end
-    end = util.element_screen_center(element)
+    end = element_screen_center(driver, element)
     end["left"] += 2  # Move it off-center for this test
 
     element.click()
@@ -604,7 +638,7 @@ def step_impl(context):
     # From the label to before the first letter and then past the
     # first letter.
     ActionChains(driver)\
-        .send_keys(*[Keys.ARROW_RIGHT] * 2)\
+        .send_keys(Keys.ARROW_RIGHT * 2)\
         .perform()
 
     # We need to get the location of the caret.
@@ -616,7 +650,7 @@ def step_impl(context):
 
     context.expected_selection = parent_text[0:1]
     context.selection_parent = parent
-    context.caret_screen_position = wedutil.caret_screen_pos(driver)
+    record_caret_screen_pos(context)
 
 
 @then(u'the text is selected')
@@ -635,7 +669,7 @@ def step_impl(context):
     context.window_scroll_top = util.window_scroll_top()
     context.window_scroll_left = util.window_scroll_left()
 
-    wed = util.find_element((By.CLASS_NAME, "wed-scroller"))
+    wed = find_cached_element(context, ".wed-scroller")
 
     scroll_top = util.scroll_top(wed)
 
@@ -656,8 +690,9 @@ def step_impl(context):
     util = context.util
     prev_pos = context.caret_screen_position
 
-    util.wait(lambda *_: wedutil.caret_screen_pos(driver)["top"] ==
-              prev_pos["top"] - context.scrolled_editor_pane_by)
+    wait(util,
+         lambda *_: wedutil.caret_screen_pos(driver)["top"] ==
+         prev_pos["top"] - context.scrolled_editor_pane_by)
 
 
 @when("the user selects a region that is malformed")
@@ -674,14 +709,14 @@ def step_impl(context):
 
     # On IE, sending the keys to the element itself does not work.
     send_to = element if driver.name != "internet explorer" else \
-        util.find_element((By.CSS_SELECTOR, ".wed-document"))
+        find_cached_element(context, ".wed-document")
 
     util.send_keys(send_to,
                    # From the label to before the first letter and then past
                    # the first letter.
-                   [Keys.ARROW_RIGHT] * 3 +
+                   Keys.ARROW_RIGHT * 3 +
                    # This moves 9 caracters to the right with shift down.
-                   [Keys.SHIFT] + [Keys.ARROW_RIGHT] * 9 + [Keys.SHIFT])
+                   Keys.SHIFT + Keys.ARROW_RIGHT * 9 + Keys.SHIFT)
 
     assert_true(util.is_something_selected(), "something must be selected")
 
@@ -690,7 +725,8 @@ def step_impl(context):
 def step_impl(context):
     driver = context.driver
 
-    el, _, parent_text = get_element_parent_and_parent_text(driver, ".ref")
+    el, parent, parent_text = get_element_parent_and_parent_text(driver,
+                                                                 ".ref")
 
     ActionChains(driver)\
         .move_to_element_with_offset(el, 1, 1)\
@@ -698,13 +734,13 @@ def step_impl(context):
         .perform()
 
     assert_true(parent_text.find("A") == -1)
+    context.clicked_uneditable_parent = parent
 
 
 @then(u'the uneditable text\'s parent contains "A"')
 def step_impl(context):
-    driver = context.driver
-
-    _, _, parent_text = get_element_parent_and_parent_text(driver, ".ref")
+    parent_text = get_text_excluding_children(
+        context.driver, context.clicked_uneditable_parent)
 
     assert_true(parent_text.find("A") != -1)
 
@@ -726,24 +762,36 @@ def step_impl(context):
 
 @when(ur"the user clicks in the middle of a piece of text")
 def step_impl(context):
-    util = context.util
     driver = context.driver
-    button = util.find_element(
-        (By.CSS_SELECTOR, ".body .__start_label._p_label"))
-    ActionChains(driver)\
-        .click(button)\
-        .send_keys([Keys.ARROW_RIGHT] * 6) \
-        .perform()
+    util = context.util
 
-    context.caret_path = driver.execute_script("""
-    var caret = wed_editor.caretManager.getDataCaret();
-    return [wed_editor.dataUpdater.nodeToPath(caret.node), caret.offset];
-    """)
+    button = util.find_element((By.CSS_SELECTOR,
+                                ".body .__start_label._p_label"))
+
+    # We put the caret after the 5th character of the paragraph's
+    # text, and then get the data caret, the caret position (as
+    # computed by wedutil.caret_selection_pos) and the position of the
+    # button in one go.
+    context.caret_path, pos, el_pos = run_js(context, """
+    var button = arguments[0];
+    var p = wed_editor.toDataNode(button.parentNode);
+    var text = p.firstChild;
+    while (text.nodeType !== Node.TEXT_NODE) {
+      text = text.nextSibling;
+    }
+    wed_editor.caretManager.setCaret(text, 5);
+    var mark = wed_editor.caretManager.mark.getBoundingClientRect();
+    var rect = button.getBoundingClientRect();
+    return [window.__wedTestHelpers.dataCaretPath(),
+            {left: mark.left, top: mark.top + mark.height / 2},
+            {left: rect.left, top: rect.top}];
+    """, button)
+
+    round_pos(pos)
 
-    pos = wedutil.caret_selection_pos(driver)
     # First click away so that the caret is no longer where we left it
-    # and the subsequent click moves it again.
-    el_pos = util.element_screen_position(button)
+    # and the subsequent click moves it again. Without this click, the
+    # step would pass even if the click in the text did nothing.
     ActionChains(driver) \
         .click(button) \
         .move_to_element_with_offset(button,
@@ -756,8 +804,6 @@ def step_impl(context):
 @then(ur"the caret is set next to the clicked location")
 def step_impl(context):
     driver = context.driver
-    caret_path = driver.execute_script("""
-    var caret = wed_editor.caretManager.getDataCaret();
-    return [wed_editor.dataUpdater.nodeToPath(caret.node), caret.offset];
-    """)
+    caret_path = driver.execute_script(
+        "return window.__wedTestHelpers.dataCaretPath();")
     assert_equal(context.caret_path, caret_path)
@@ -7,6 +7,8 @@ from nose.tools import assert_true
 
 import wedutil
 
+from ..util import find_nth_element
+
 # Don't complain about redefined functions
 # pylint: disable=E0102
 
@@ -28,17 +30,18 @@ def step_impl(context, direction, what):
 
     spec = DIRECTION_TO_SPEC[direction]
 
-    el = driver.find_elements_by_css_selector(
-        ".__{0}_label._{1}_label".format(spec.label, what))
+    el = find_nth_element(driver,
+                          ".__{0}_label._{1}_label".format(spec.label, what),
+                          -1)
 
     offset = spec.offset
 
     # It is an offset from the border of the label.
     if offset > 0:
-        offset += el[-1].size["width"]
+        offset += el.size["width"]
 
     ActionChains(driver) \
-        .move_to_element_with_offset(el[-1], offset, 1) \
+        .move_to_element_with_offset(el, offset, 1) \
         .click() \
         .perform()
 
@@ -57,7 +60,7 @@ def step_impl(context, order, what):
 
     position = ORDER_TO_POS[order]
 
-    el = driver.find_elements_by_css_selector("." + what)[position]
+    el = find_nth_element(driver, "." + what, position)
 
     wedutil.wait_for_caret_to_be_in(util, el)
 
@@ -67,7 +70,9 @@ def step_impl(context, order, what):
 def step_impl(context, label, what):
     driver = context.driver
 
-    el = driver.find_elements_by_css_selector(
-        ".__{0}_label._{1}_label".format(label, what))[-1]
+    clicked = driver.execute_script("""
+    var els = document.querySelectorAll(arguments[0]);
+    return els[els.length - 1].classList.contains("_label_clicked");
+    """, ".__{0}_label._{1}_label".format(label, what))
 
-    assert_true("_label_clicked" in el.get_attribute("class").split())
+    assert_true(clicked)
@@ -13,8 +13,8 @@ from nose.tools import assert_equal, assert_true, \
 
 import wedutil
 
-from ..util import Trigger, get_element_parent_and_parent_text, \
-    get_real_siblings
+from ..util import Trigger, get_element_and_parent, count_real_siblings, \
+    find_nth_element, find_cached_element, get_text_excluding_children
 
 step_matcher("re")
 
@@ -63,7 +63,7 @@ def context_menu_on_start_label_of_element(context):
     driver = context.driver
     util = context.util
 
-    button, parent, _ = get_element_parent_and_parent_text(
+    button, parent = get_element_and_parent(
         driver, ".__start_label._p_label")
     ActionChains(driver)\
         .context_click(button)\
@@ -78,7 +78,7 @@ def context_menu_on_start_label_of_element(context):
     driver = context.driver
     util = context.util
 
-    button, parent, _ = get_element_parent_and_parent_text(
+    button, parent = get_element_and_parent(
         driver, ".__end_label._titleStmt_label")
     ActionChains(driver)\
         .context_click(button)\
@@ -104,7 +104,7 @@ def context_menu_on_start_label_of_element(context):
     util = context.util
 
     clicked = context.clicked_element
-    button, parent, _ = get_element_parent_and_parent_text(
+    button, parent = get_element_and_parent(
         driver, ".__end_label._sourceDesc_label")
 
     assert_not_equal(clicked, button)
@@ -139,7 +139,7 @@ def context_menu_on_end_label_of_element(context):
     driver = context.driver
     util = context.util
 
-    button, parent, _ = get_element_parent_and_parent_text(
+    button, parent = get_element_and_parent(
         driver, ".__end_label._p_label")
     ActionChains(driver)\
         .context_click(button)\
@@ -153,7 +153,7 @@ def context_menu_on_text(context):
     driver = context.driver
     util = context.util
 
-    element = util.find_element((By.CLASS_NAME, "title"))
+    element = find_cached_element(context, ".title")
     ActionChains(driver)\
         .move_to_element(element)\
         .context_click()\
@@ -167,7 +167,7 @@ def context_menu_on_uneditable_text(context):
     driver = context.driver
     util = context.util
 
-    element, parent, _ = get_element_parent_and_parent_text(
+    element, parent = get_element_and_parent(
         driver, ".ref>._phantom._text")
     ActionChains(driver)\
         .move_to_element(element)\
@@ -214,9 +214,8 @@ def context_menu_outside_wed(context):
 @When("the user clicks outside the context menu")
 def user_clicks_outside_context_menu(context):
     driver = context.driver
-    util = context.util
 
-    title = util.find_element((By.CLASS_NAME, "title"))
+    title = find_cached_element(context, ".title")
     # This simulates a user whose hand is not completely steady.
     ActionChains(driver)\
         .move_to_element(title)\
@@ -364,7 +363,7 @@ def step_impl(context, choice):
         return [$parent[0], $ph[0]];
         """)
     elif choice == "text":
-        where = util.find_element((By.CLASS_NAME, "title"))
+        where = find_cached_element(context, ".title")
         parent = where
     else:
         raise ValueError("unknown choice: " + choice)
@@ -506,13 +505,13 @@ def step_impl(context, choice, new=None, name=None):
         context.context_menu_pre_transformation_info = info
         if choice in ("before", "after"):
             info["preceding"], info["following"] = \
-                get_real_siblings(driver, for_element)
+                count_real_siblings(driver, for_element)
         elif choice == "new":
             info["children"] = driver.execute_script("""
             return jQuery(arguments[0]).children("._real").toArray();
             """, for_element)
     context.clicked_context_menu_item = \
-        util.get_text_excluding_children(link).strip()
+        get_text_excluding_children(driver, link).strip()
 
     # On Edge, the autoscrolling is crap. It brings the element only half into
     # view.
@@ -547,7 +546,7 @@ def step_impl(context):
             .perform()
 
     context.clicked_context_menu_item = \
-        util.get_text_excluding_children(link).strip()
+        get_text_excluding_children(driver, link).strip()
 
 
 @When(ur"the user clicks on a placeholder that will serve to bring up "
@@ -660,10 +659,11 @@ def step_impl(context, item, what):
     if what == "type" and item == "other":
         index = len(FILTER_TO_INDEX) - 1
 
-    buttons = driver.find_elements_by_css_selector(
-        ".wed-context-menu li:first-child button")
+    button = find_nth_element(driver,
+                              ".wed-context-menu li:first-child button",
+                              index)
 
-    buttons[index].click()
+    button.click()
 
 
 @then(ur'the context menu contains only the option "(?P<option>.*?)"')
@@ -17,6 +17,7 @@ def step_impl(context):
     title = util.find_element((By.CSS_SELECTOR,
                                ".__start_label._title_label"))
     context.clicked_element = title
+    context.clicked_element_name = None
 
     ActionChains(driver)\
         .click(title)\
@@ -10,7 +10,9 @@ from selenium.webdriver.common.keys import Keys
 from selenium.common.exceptions import NoAlertPresentException
 
 import wedutil
-from ..util import get_element_parent_and_parent_text, wait_for_editor
+from ..util import get_element_parent_and_parent_text, wait_for_editor, \
+    record_caret_screen_pos, caret_screen_pos, find_cached_element, \
+    get_text_excluding_children
 
 # Don't complain about redefined functions
 # pylint: disable=E0102
@@ -69,7 +71,7 @@ def step_impl(context):
     driver = context.driver
 
     context.caret_screen_position_before_focus_loss = \
-        wedutil.caret_screen_pos(driver)
+        caret_screen_pos(context)
 
     driver.execute_script("window.open('http://www.google.com')")
     driver.switch_to_window([x for x in driver.window_handles
@@ -120,8 +122,8 @@ def step_impl(context, text):
     wedutil.wait_for_caret_to_be_in(util, element)
     context.element_to_test_for_text = element
     assert_true(
-        util.get_text_excluding_children(element).find(text) == -1)
-    context.caret_screen_position = wedutil.caret_screen_pos(driver)
+        get_text_excluding_children(driver, element).find(text) == -1)
+    record_caret_screen_pos(context)
 
 
 @when('the user clicks on the start label of an element that does not '
@@ -144,7 +146,7 @@ def step_impl(context):
 
     label = util.find_element((By.CSS_SELECTOR,
                                ".__end_label._titleStmt_label"))
-    title = util.find_element((By.CSS_SELECTOR, ".titleStmt>.title"))
+    title = find_cached_element(context, ".titleStmt>.title")
     ActionChains(driver)\
         .click(title)\
         .perform()
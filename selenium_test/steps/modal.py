@@ -5,6 +5,8 @@ from nose.tools import assert_equal
 
 import wedutil
 
+from ..util import find_cached_element
+
 step_matcher('re')
 
 
@@ -27,7 +29,7 @@ def step_impl(context, kind):
     util = context.util
     driver = context.driver
 
-    element = util.find_element((By.CSS_SELECTOR, ".title"))
+    element = find_cached_element(context, ".title")
     ActionChains(driver) \
         .click(element) \
         .perform()
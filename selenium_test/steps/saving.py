@@ -12,21 +12,25 @@ from selenic.util import Result, Condition
 
 step_matcher("re")
 
+# Shared so that polling the saved data reuses the same connection.
+_SESSION = requests.Session()
+_SESSION.headers.update({"Accept": "text/plain"})
+
 
 @when('the user saves')
 def step_impl(context):
     util = context.util
     util.ctrl_equivalent_x('s')
 
-last_obj_re = re.compile('.*}{')
-
-flip_rend_style_re = re.compile(ur'(style="[^"]*?") (rend="[^"]*?")')
-flip_xmlns_re = re.compile(ur'(xmlns:math="[^"]*?") (xmlns="[^"]*?")')
+# These match the attribute orders of the expected data, which some
+# browsers serialize differently.
+flip_rend_style_re = re.compile(ur'(rend="[^"]*?") (style="[^"]*?")')
+flip_xmlns_re = re.compile(ur'(xmlns="[^"]*?") (xmlns:math="[^"]*?")')
 flip_div_attrs_re = re.compile(
-    ur'(type="[^"]*?") (rend="[^"]*?") (rendition="[^"]*?") '
-    ur'(subtype="[^"]*?")')
+    ur'(type="[^"]*?") (subtype="[^"]*?") (rend="[^"]*?") '
+    ur'(rendition="[^"]*?")')
 
-flip_moo_re = re.compile(ur'(moo="[^"]*?") (MOO="[^"]*?")')
+flip_moo_re = re.compile(ur'(MOO="[^"]*?") (moo="[^"]*?")')
 
 _SCENARIO_TO_EXPECTED_DATA = {
     "serializes namespaces properly":
@@ -69,42 +73,68 @@ xmlns:math="http://www.w3.org/1998/Math/MathML"><teiHeader><fileDesc>\
 }
 
 
+def _ie_order(data):
+    data = flip_rend_style_re.sub(ur'\2 \1', data)
+    data = flip_xmlns_re.sub(ur'\2 \1', data)
+    return flip_div_attrs_re.sub(ur'\1 \3 \4 \2', data)
+
+
+def _edge_order(data):
+    data = flip_rend_style_re.sub(ur'\2 \1', data)
+    data = flip_div_attrs_re.sub(ur'\1 \3 \4 \2', data)
+    return flip_moo_re.sub(ur'\2 \1', data)
+
+
+# The expected data, in the attribute order that each browser produces.
+_EXPECTED_BY_BROWSER = {
+    "ie": dict((name, _ie_order(data)) for (name, data)
+               in _SCENARIO_TO_EXPECTED_DATA.iteritems()),
+    "edge": dict((name, _edge_order(data)) for (name, data)
+                 in _SCENARIO_TO_EXPECTED_DATA.iteritems()),
+    "default": _SCENARIO_TO_EXPECTED_DATA,
+}
+
+
 @then('the data saved is properly serialized')
 def step_impl(context):
     util = context.util
 
+    browser = "ie" if util.ie else "edge" if util.edge else "default"
     expected = {
         u'command': u'save',
-        u'data': _SCENARIO_TO_EXPECTED_DATA[context.scenario.name]
+        u'data': _EXPECTED_BY_BROWSER[browser][context.scenario.name]
     }
 
+    url = urljoin(context.local_server, "/build/ajax/save.txt")
+    previous = {"etag": None, "text": None, "result": None}
+
     def cond(_driver):
-        resp = requests.get(urljoin(context.local_server,
-                                    "/build/ajax/save.txt"))
-        text = resp.text.replace('\n***\n', '').strip()
-        text = last_obj_re.sub('{', text)
+        headers = {}
+        if previous["etag"] is not None:
+            headers["If-None-Match"] = previous["etag"]
+        # The timeout keeps a stalled server from blocking the wait,
+        # which cannot interrupt a call in progress.
+        resp = _SESSION.get(url, headers=headers, timeout=2)
+        # Nothing was saved since the last check, so the result is the
+        # same.
+        if resp.status_code == 304 or resp.text == previous["text"]:
+            return previous["result"]
+
+        previous["etag"] = resp.headers.get("ETag")
+        text = previous["text"] = resp.text
+        text = text.replace('\n***\n', '').strip()
+        # Keep only the last object saved.
+        last = text.rfind('}{')
+        if last != -1:
+            text = text[last + 1:]
         actual = json.loads(text)
         # We don't care about the version here.
         del actual["version"]
-        if u"data" in actual:
-            if util.ie:
-                actual[u"data"] =  \
-                    flip_rend_style_re.sub(ur'\2 \1', actual[u"data"])
-                actual[u"data"] = \
-                    flip_xmlns_re.sub(ur'\2 \1', actual[u"data"])
-                actual[u"data"] = \
-                    flip_div_attrs_re.sub(ur'\1 \4 \2 \3', actual[u"data"])
-            elif util.edge:
-                actual[u"data"] =  \
-                    flip_rend_style_re.sub(ur'\2 \1', actual[u"data"])
-                actual[u"data"] = \
-                    flip_div_attrs_re.sub(ur'\1 \4 \2 \3', actual[u"data"])
-                actual[u"data"] = flip_moo_re.sub(ur'\2 \1', actual[u"data"])
-
-        return Result(actual == expected, [actual, expected])
+        result = previous["result"] = Result(actual == expected,
+                                             [actual, expected])
+        return result
 
     result = Condition(util, cond).wait()
 
-    assert_equal.__self__.maxDiff = None
     if not result:
         assert_equal(result.payload[0], result.payload[1])
@@ -2,7 +2,7 @@
 from nose.tools import assert_equal, assert_is_not_none
 from selenium.webdriver.support.wait import TimeoutException
 
-from ..util import get_real_siblings
+from ..util import count_real_siblings, wait, get_text_excluding_children
 
 step_matcher("re")
 
@@ -18,10 +18,10 @@ def step_impl(context):
     element_name = item[len("Wrap in "):]
     parent = context.selection_parent
 
-    child = util.wait(lambda *_:
-                      parent.find_element_by_class_name(element_name))
+    child = wait(util,
+                 lambda *_: parent.find_element_by_class_name(element_name))
 
-    assert_equal(util.get_text_excluding_children(child),
+    assert_equal(get_text_excluding_children(context.driver, child),
                  context.expected_selection)
 
 
@@ -32,10 +32,10 @@ def step_impl(context):
     info = context.context_menu_pre_transformation_info
     assert_is_not_none(for_element)
 
-    preceding, following = get_real_siblings(driver, for_element)
-    assert_equal(len(info["preceding"]) + 1, len(preceding),
+    preceding, following = count_real_siblings(driver, for_element)
+    assert_equal(info["preceding"] + 1, preceding,
                  "items before the selected element")
-    assert_equal(len(info["following"]), len(following),
+    assert_equal(info["following"], following,
                  "items after the selected element")
 
 
@@ -46,10 +46,10 @@ def step_impl(context):
     info = context.context_menu_pre_transformation_info
     assert_is_not_none(for_element)
 
-    preceding, following = get_real_siblings(driver, for_element)
-    assert_equal(len(info["preceding"]), len(preceding),
+    preceding, following = count_real_siblings(driver, for_element)
+    assert_equal(info["preceding"], preceding,
                  "items before the selected element")
-    assert_equal(len(info["following"]) + 1, len(following),
+    assert_equal(info["following"] + 1, following,
                  "items after the selected element")
 
 
@@ -67,7 +67,7 @@ def step_impl(context, what):
         """, for_element)
         return len(info["children"]) + 1 == len(children)
 
-    util.wait(cond)
+    wait(util, cond)
 
 
 @then(ur"the teiHeader has been filled as much as possible")
@@ -76,34 +76,11 @@ def step_impl(context):
     driver = context.driver
 
     def cond(*_):
-        test, _ = driver.execute_script("""
-        var $children = jQuery("._real.teiHeader>._real");
-        if (!($children.length === 1 && $children.eq(0).is(".fileDesc")))
-            return [false, "teiHeader contents"];
-
-        $children = jQuery("._real.fileDesc>._real");
-        if (!($children.length === 3 && $children.eq(0).is(".titleStmt") &&
-              $children.eq(1).is(".publicationStmt") &&
-              $children.eq(2).is(".sourceDesc")))
-            return [false, "fileDesc contents"];
-
-
-        $children = jQuery("._real.titleStmt>._real");
-        if (!($children.length === 1 && $children.eq(0).is(".title")))
-            return [false, "titleStmt contents"];
-
-
-        $children = jQuery("._real.title>._real, " +
-                           "._real.publicationStmt>._real, " +
-                           "._real.sourceDesc>._real");
-        if ($children.length !== 0)
-            return [false, "contents of end elements"];
-
-        return [true, ""];
-        """)
+        test, _ = driver.execute_script(
+            "return window.__wedTestHelpers.teiHeaderFilled();")
         return test
 
-    util.wait(cond)
+    wait(util, cond)
 
 
 @then(ur"the teiHeader has not been filled")
@@ -112,16 +89,11 @@ def step_impl(context):
     driver = context.driver
 
     def cond(*_):
-        test, _ = driver.execute_script("""
-        var $children = jQuery("._real.teiHeader>._real");
-        if ($children.length !== 0)
-            return [false, "contents of teiHeader"];
-
-        return [true, ""];
-        """)
+        test, _ = driver.execute_script(
+            "return window.__wedTestHelpers.teiHeaderNotFilled();")
         return test
 
-    util.wait(cond)
+    wait(util, cond)
 
 
 @then(ur"the editor pane contains only a placeholder")
@@ -139,7 +111,7 @@ def step_impl(context):
         return node.classList.contains("_placeholder");
         """)
 
-    context.util.wait(check)
+    wait(context.util, check)
 
 
 @then(ur"the document contains only a book element")
@@ -157,4 +129,4 @@ def step_impl(context):
         return node.tagName === "book";
         """)
 
-    context.util.wait(check)
+    wait(context.util, check)
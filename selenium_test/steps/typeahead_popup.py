@@ -3,6 +3,8 @@ from selenium.webdriver.common.by import By
 from nose.tools import assert_equal, assert_true
 from selenic.util import Result, Condition
 
+from ..util import find_cached_element, get_text_excluding_children
+
 step_matcher("re")
 
 
@@ -70,11 +72,10 @@ def step_impl(context):
 
 @then("the typeahead popup's action (?P<is_>is|is not) performed")
 def step_impl(context, is_):
-    util = context.util
-
     element = context.context_menu_for
     expected = "Test 0" if is_ == "is" else ""
-    assert_equal(util.get_text_excluding_children(element), expected)
+    assert_equal(get_text_excluding_children(context.driver, element),
+                 expected)
 
 
 @when(ur"the user clicks the first typeahead choice")
@@ -88,9 +89,7 @@ def step_impl(context):
 
 @when(ur"the user clicks outside the typeahead")
 def step_impl(context):
-    util = context.util
-
-    title = util.find_element((By.CLASS_NAME, "title"))
+    title = find_cached_element(context, ".title")
     ActionChains(context.driver) \
         .click(title) \
         .perform()
@@ -3,11 +3,13 @@ import re
 from selenium.webdriver.common.action_chains import ActionChains
 from selenium.webdriver.common.keys import Keys
 from selenium.webdriver.common.by import By
+from selenium.common.exceptions import TimeoutException
 
 from nose.tools import assert_equal  # pylint: disable=E0611
 from behave import step_matcher
 
-import wedutil
+from ..util import find_nth_element, wait_for_dom, \
+    get_text_excluding_children, wait
 
 # Don't complain about redefined functions
 # pylint: disable=E0102
@@ -16,25 +18,35 @@ import wedutil
 @when(u'the user deletes all text letter by letter in an element')
 def step_impl(context):
     driver = context.driver
-    element, context.emptied_element = driver.execute_script("""
+    element, context.emptied_element, length = driver.execute_script("""
     var el = document.querySelector(".__start_label._title_label");
-    return [el, el.parentNode];
+    var parent = el.parentNode;
+    return [el, parent, wed_editor.toDataNode(parent).textContent.length];
     """)
 
     context.element_to_test_for_text = context.emptied_element
-    keys = [Keys.ARROW_RIGHT] + [Keys.DELETE] * 20
+    # Send only as many deletes as there are characters to delete.
     ActionChains(driver)\
         .click(element)\
-        .send_keys(*keys)\
+        .send_keys(Keys.ARROW_RIGHT + Keys.DELETE * length)\
         .perform()
 
 
 @given(u'that the user has deleted all the text in an element')
 def step_impl(context):
-    context.execute_steps(u"""
-    When the user deletes all text letter by letter in an element
-    Then a placeholder is present in the element
+    # The scenarios that start here do not test how text is deleted, so
+    # we empty the element through the editor rather than with keys.
+    context.emptied_element = context.driver.execute_script("""
+    var parent =
+      document.querySelector(".__start_label._title_label").parentNode;
+    var data = wed_editor.toDataNode(parent);
+    wed_editor.dataUpdater.removeNodes(
+      Array.prototype.slice.call(data.childNodes));
+    wed_editor.caretManager.setCaret(data, 0);
+    return parent;
     """)
+    context.element_to_test_for_text = context.emptied_element
+    placeholder_is_present(context)
 
 
 #
@@ -62,37 +74,34 @@ def step_impl(context, text):
 
 
 @then(u'a placeholder is present in the element')
-def step_impl(context):
-    driver = context.driver
-    util = context.util
-
-    element = context.emptied_element
-    util.wait(lambda *_: element.find_element(By.CLASS_NAME, "_placeholder"))
+def placeholder_is_present(context):
+    wait_for_dom(context.util, """
+    function (el) {
+      return el.querySelector("._placeholder") !== null;
+    }
+    """, context.emptied_element)
 
 
 @then(u'"{text}" is in the text')
 def step_impl(context, text):
-    driver = context.driver
-    util = context.util
-
-    def condition(*_):
-        el_text = util.get_text_excluding_children(
-            context.element_to_test_for_text)
-        return el_text.find(text) != -1
-    util.wait(condition)
+    wait_for_dom(context.util, """
+    function (el, text) {
+      return window.__wedTestHelpers.textExcludingChildren(el)
+        .indexOf(text) !== -1;
+    }
+    """, context.element_to_test_for_text, text)
 
 step_matcher('re')
 
 
 @then(u'ESCAPE is not in the text')
 def step_impl(context):
-    util = context.util
-
-    def condition(*_):
-        el_text = util.get_text_excluding_children(
-            context.element_to_test_for_text)
-        return el_text.find(u"\u001b") == -1
-    util.wait(condition)
+    wait_for_dom(context.util, """
+    function (el) {
+      return window.__wedTestHelpers.textExcludingChildren(el)
+        .indexOf("\\u001b") === -1;
+    }
+    """, context.element_to_test_for_text)
 
 
 @when(u'the user types (?P<choice>ENTER|ESCAPE|DELETE|BACKSPACE|F1)')
@@ -111,16 +120,22 @@ def step_impl(context):
 
 @then(u'the last letter of the element\'s text is deleted')
 def step_impl(context):
-    driver = context.driver
     util = context.util
-    initial_pos = context.caret_position_before_arrow
-
-    util.wait(lambda *_: initial_pos != wedutil.caret_screen_pos(driver))
 
     initial = context.clicked_element_parent_initial_text
     parent = context.clicked_element_parent
-    final = util.get_text_excluding_children(parent)
-    assert_equal(initial[:-1], final, "edited text")
+
+    try:
+        wait_for_dom(util, """
+        function (el, expected) {
+          return window.__wedTestHelpers.textExcludingChildren(el) ===
+            expected;
+        }
+        """, parent, initial[:-1])
+    except TimeoutException:
+        assert_equal(initial[:-1],
+                     get_text_excluding_children(context.driver, parent),
+                     "edited text")
 
 
 @then(ur'the (?P<ordinal>first|second) (?P<what>".*?"|paragraph) in body has '
@@ -134,12 +149,12 @@ def step_impl(context, ordinal, what, text):
     else:
         what = what[1:-1]  # drop the quotes.
 
-    els = util.find_elements((By.CSS_SELECTOR, ".body ." +
-                              what.replace(":", ur"\:")))
+    el = wait(util, lambda driver: find_nth_element(
+        driver, ".body ." + what.replace(":", ur"\:"), index))
 
-    def cond(*_):
-        return util.get_text_excluding_children(els[index]) == text
-    util.wait(cond)
+    def cond(driver):
+        return get_text_excluding_children(driver, el) == text
+    wait(util, cond)
 
 
 @when(ur'the user closes the pasting modal by accepting it')
@@ -160,4 +175,4 @@ def step_impl(context):
         """)
         return text == context.expected_selection_serialization
 
-    context.util.wait(cond)
+    wait(context.util, cond)
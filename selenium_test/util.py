@@ -1,5 +1,15 @@
+import time
+
 import wedutil
 from selenium.webdriver.common.action_chains import ActionChains
+from selenium.webdriver.common.by import By
+from selenium.common.exceptions import TimeoutException
+from selenium.webdriver.support.ui import WebDriverWait
+
+#: How often, in seconds, :func:`wait` checks its condition. Most of the
+#: changes we wait for happen within milliseconds, so the default of
+#: ``WebDriverWait`` (half a second) mostly adds latency.
+POLL_FREQUENCY = 0.05
 
 
 class Trigger(object):
@@ -55,40 +65,121 @@ class Trigger(object):
             return self.el.size
 
 
+def run_js(context, script, *args):
+    """
+    Runs ``script`` through the driver's ``execute_script``. When the
+    ``BEHAVE_SCRIPT_TIMINGS`` environment variable is set, the time the
+    script took, round-trip included, is printed so that regressions in
+    the time taken by steps can be tracked.
+    """
+    driver = context.driver
+    if not context.script_timings:
+        return driver.execute_script(script, *args)
+
+    start = time.time()
+    ret = driver.execute_script(script, *args)
+    print("Script took {0:.3f}s".format(time.time() - start))
+    return ret
+
+
 def get_element_parent_and_parent_text(driver, selector):
     """
     Given a CSS selector, return the element found, its parent and the
     text of the parent, excluding any children.
     """
     return driver.execute_script("""
-    var button = jQuery(arguments[0])[0];
+    var button = document.querySelector(arguments[0]);
     var parent = button.parentNode;
-    var parent_text = jQuery(parent).contents().filter(function() {
-       return this.nodeType == Node.TEXT_NODE;
-    }).text();
-    return [button, parent, parent_text];
+    return [button, parent,
+            window.__wedTestHelpers.textExcludingChildren(parent)];
     """, selector)
 
 
-def get_real_siblings(driver, element):
+def find_nth_element(driver, selector, index):
     """
-    Returns a couple whose first member is the list of siblings before
-    ``element``, and the second member is the list of siblings after
-    ``element``. All siblings must be of the ``_real`` class.
+    Finds the element at position ``index`` among the elements that
+    match the CSS ``selector``. A negative ``index`` counts from the
+    end, as in Python. Only the element wanted is sent back by the
+    browser, rather than all the elements that match.
+
+    :returns: The element, or ``None`` if there is no such element.
+    """
+    return driver.execute_script("""
+    var els = document.querySelectorAll(arguments[0]);
+    var index = arguments[1];
+    return els[index < 0 ? els.length + index : index] || null;
+    """, selector, index)
+
+
+def get_element_and_parent(driver, selector):
+    """
+    Given a CSS selector, return the element found and its parent. Use
+    this rather than :func:`get_element_parent_and_parent_text` when the
+    text of the parent is not needed.
+    """
+    return driver.execute_script("""
+    var button = document.querySelector(arguments[0]);
+    return [button, button.parentNode];
+    """, selector)
+
+
+def get_selection_state(driver):
+    """
+    Gets at once what ``selenic.util.Util.is_something_selected`` and
+    ``selenic.util.Util.get_selection_text`` would return.
+
+    :returns: A couple whose first member is whether something is
+              selected, and the second member is the text of the
+              selection.
+    """
+    return driver.execute_script("""
+    var sel = window.getSelection();
+    var texts = [];
+    var limit = sel.rangeCount;
+    for (var i = 0; i < limit; ++i) {
+       texts.push(sel.getRangeAt(i).toString());
+    }
+    return [!!(limit && !sel.getRangeAt(0).collapsed), texts.join("")];
+    """)
+
+
+def get_text_excluding_children(driver, element):
+    """
+    Gets the text of ``element``, excluding the text of its children,
+    with a function defined in the page by :func:`wait_for_editor`.
+
+    :param driver: The Selenium driver.
+    :param element: The element whose text we want.
+    :returns: The text.
+    :rtype: :class:`str`
+    """
+    return driver.execute_script(
+        "return window.__wedTestHelpers.textExcludingChildren(arguments[0]);",
+        element)
+
+
+def count_real_siblings(driver, element):
+    """
+    Returns a couple whose first member is the number of siblings before
+    ``element``, and the second member is the number of siblings after
+    ``element``. Only siblings of the ``_real`` class are counted.
     """
     preceding, following = driver.execute_script("""
     var el = arguments[0];
-    var before = [];
-    var after = [];
-    var child = el.parentNode.firstElementChild;
-    var into = before;
-
-    while(child) {
-        if (child === el)
-            into = after;
-        else if (child.classList.contains("_real"))
-            into.push(child);
-        child = child.nextElementSibling;
+    var before = 0;
+    var after = 0;
+    var child;
+
+    for (child = el.previousElementSibling; child;
+         child = child.previousElementSibling) {
+        if (child.classList.contains("_real"))
+            before++;
+    }
+
+    for (child = el.nextElementSibling; child;
+         child = child.nextElementSibling) {
+        if (child.classList.contains("_real"))
+            after++;
     }
     return [before, after];
     """, element)
@@ -96,11 +187,326 @@ def get_real_siblings(driver, element):
     return (preceding, following)
 
 
+def element_screen_center(driver, element):
+    """
+    Gets the center point of an element. This computes the same point as
+    ``selenic.util.Util.element_screen_center`` but it does so in a
+    single script rather than by also querying the size of the element
+    through Selenium.
+
+    :returns: The center point of the element.
+    :rtype: class:`dict` with the field "left" set to the X
+            coordinate and the field "top" set to the Y
+            coordinate.
+    """
+    return driver.execute_script("""
+    var rect = arguments[0].getBoundingClientRect();
+    return {left: rect.left + Math.floor(rect.width / 2),
+            top: rect.top + Math.floor(rect.height / 2)};
+    """, element)
+
+
+def round_pos(pos):
+    """
+    Rounds the ``left`` and ``top`` coordinates of ``pos`` in place,
+    because ChromeDriver chokes on float values.
+
+    :returns: ``pos``
+    """
+    pos["left"] = round(pos["left"])
+    pos["top"] = round(pos["top"])
+    return pos
+
+
+def _caret_selection_pos_pair(driver, before, between, direction, label):
+    start, end, parent, parent_text = driver.execute_script("""
+    var before = arguments[0];
+    var between = arguments[1];
+    var direction = arguments[2];
+    var label = arguments[3] ? document.querySelector(arguments[3]) : null;
+    var caretManager = wed_editor.caretManager;
+
+    function pos() {
+      var rect = caretManager.mark.getBoundingClientRect();
+      return { left: rect.left, top: rect.top + rect.height / 2 };
+    }
+
+    var parent = null;
+    var parent_text = null;
+    if (label) {
+      parent = label.parentNode;
+      parent_text = window.__wedTestHelpers.textExcludingChildren(parent);
+      caretManager.setCaret(label.getElementsByClassName("_element_name")[0],
+                            0);
+    }
+
+    var i;
+    for (i = 0; i < before; ++i)
+      caretManager.move(direction);
+    var start = pos();
+    for (i = 0; i < between; ++i)
+      caretManager.move(direction);
+    return [start, pos(), parent, parent_text];
+    """, before, between, direction, label)
+
+    return (round_pos(start), round_pos(end), parent, parent_text)
+
+
+def caret_selection_pos_pair(driver, before, between, direction="right"):
+    """
+    Moves the caret ``before`` times in ``direction``, records the caret
+    position, moves it ``between`` more times and records the caret
+    position again. This is done in a single script so that selecting
+    text does not require a round-trip per caret movement and per
+    position query.
+
+    The positions are computed like ``wedutil.caret_selection_pos``
+    computes them.
+
+    :returns: A couple whose first member is the first position
+              recorded and the second member is the second position
+              recorded.
+    """
+    return _caret_selection_pos_pair(driver, before, between, direction,
+                                     None)[:2]
+
+
+def label_caret_selection_pos_pair(driver, selector, before, between,
+                                   direction="right"):
+    """
+    Puts the caret in the name of the label matching ``selector``, like
+    a click on the label would, and then records positions like
+    :func:`caret_selection_pos_pair` does, in the same script.
+
+    :returns: The two positions recorded, the parent of the label and
+              the text of the parent (excluding its children).
+    """
+    return _caret_selection_pos_pair(driver, before, between, direction,
+                                     selector)
+
+
+def wait(util, condition):
+    """
+    Waits until ``condition`` returns a true value, like ``util.wait``
+    does, but checks the condition every :data:`POLL_FREQUENCY`
+    seconds.
+
+    :param util: The selenic util object.
+    :type util: :class:`selenic.util.Util`
+    :param condition: A callable that takes the driver as argument.
+    :returns: The last value returned by ``condition``.
+    :raises selenium.common.exceptions.TimeoutException: If the
+            condition is still false when the timeout expires.
+    """
+    return WebDriverWait(util.driver, util.timeout,
+                         poll_frequency=POLL_FREQUENCY).until(condition)
+
+
+def _run_async_with_deadline(util, script, *args):
+    """
+    Runs ``script`` with ``execute_async_script``. The script gets
+    ``args`` followed by a deadline, in milliseconds, and then the
+    callback. The script must call the callback by the deadline. The
+    driver's script timeout is raised above the deadline while the
+    script runs, so that the in-page deadline is what ends the wait.
+    """
+    driver = util.driver
+    timeout = util.timeout
+    driver.set_script_timeout(timeout + 5)
+    try:
+        return driver.execute_async_script(script,
+                                           *(args + (timeout * 1000, )))
+    finally:
+        driver.set_script_timeout(timeout)
+
+
+def wait_for_caret_screen_pos(util, expected):
+    """
+    Waits until the caret is at ``expected`` on the screen. The position
+    is checked in the browser at every animation frame so that waiting
+    does not require a round-trip per check.
+
+    :param util: The selenic util object.
+    :type util: :class:`selenic.util.Util`
+    :param expected: The position, as returned by
+                     ``wedutil.caret_screen_pos``.
+    :raises selenium.common.exceptions.TimeoutException: If the caret
+            does not get to the position in time.
+    """
+    reached = _run_async_with_deadline(util, """
+    var expected = arguments[0];
+    var deadline = Date.now() + arguments[1];
+    var done = arguments[2];
+    var mark = wed_editor.caretManager.mark;
+
+    // Do what int() does on the Python side.
+    function trunc(x) {
+      return x < 0 ? Math.ceil(x) : Math.floor(x);
+    }
+
+    function check() {
+      var rect = mark.getBoundingClientRect();
+      if (trunc(rect.left) === expected.left &&
+          trunc(rect.top) === expected.top) {
+        done(true);
+      }
+      else if (Date.now() > deadline) {
+        done(false);
+      }
+      else {
+        requestAnimationFrame(check);
+      }
+    }
+    check();
+    """, expected)
+
+    if not reached:
+        raise TimeoutException("the caret did not get to the expected "
+                               "position")
+
+
+def wait_until_no_element(util, selector):
+    """
+    Waits until no element matches the CSS ``selector``. A mutation
+    observer performs the check in the browser whenever the DOM changes,
+    so the wait ends as soon as the last element stops matching and it
+    does not require a round-trip per check.
+
+    :param util: The selenic util object.
+    :type util: :class:`selenic.util.Util`
+    :raises selenium.common.exceptions.TimeoutException: If elements
+            still match when the timeout expires.
+    """
+    gone = _run_async_with_deadline(util, """
+    var selector = arguments[0];
+    var timeout = arguments[1];
+    var done = arguments[2];
+
+    if (!document.querySelector(selector)) {
+      done(true);
+      return;
+    }
+
+    var timer;
+    var observer = new MutationObserver(function () {
+      if (!document.querySelector(selector)) {
+        observer.disconnect();
+        clearTimeout(timer);
+        done(true);
+      }
+    });
+    observer.observe(document.body, {
+      subtree: true,
+      childList: true,
+      attributes: true,
+      attributeFilter: ["class"]
+    });
+    timer = setTimeout(function () {
+      observer.disconnect();
+      done(false);
+    }, timeout);
+    """, selector)
+
+    if not gone:
+        raise TimeoutException("elements still match " + selector)
+
+
+def wait_for_dom(util, predicate, *args):
+    """
+    Waits until ``predicate`` returns a true value. A mutation observer
+    calls the predicate in the browser whenever the DOM changes, so
+    waiting does not require a round-trip per check.
+
+    :param util: The selenic util object.
+    :type util: :class:`selenic.util.Util`
+    :param predicate: The source of a JavaScript function. It is called
+                      with ``args``.
+    :type predicate: :class:`str`
+    :raises selenium.common.exceptions.TimeoutException: If the
+            predicate is still false when the timeout expires.
+    """
+    met = _run_async_with_deadline(util, """
+    var predicate = """ + predicate + """;
+    var args = Array.prototype.slice.call(arguments, 0, -2);
+    var timeout = arguments[arguments.length - 2];
+    var done = arguments[arguments.length - 1];
+
+    if (predicate.apply(null, args)) {
+      done(true);
+      return;
+    }
+
+    var timer;
+    var observer = new MutationObserver(function () {
+      if (predicate.apply(null, args)) {
+        observer.disconnect();
+        clearTimeout(timer);
+        done(true);
+      }
+    });
+    observer.observe(document.body, {
+      subtree: true,
+      childList: true,
+      characterData: true
+    });
+    timer = setTimeout(function () {
+      observer.disconnect();
+      done(false);
+    }, timeout);
+    """, *args)
+
+    if not met:
+        raise TimeoutException("the DOM did not reach the expected state")
+
+
+def record_caret_screen_pos(context):
+    """
+    Records the caret's screen position in
+    ``context.caret_screen_position``. The step that immediately follows
+    the step that recorded the position can get it from
+    :func:`caret_screen_pos` without querying the browser again.
+    """
+    context.caret_screen_position = wedutil.caret_screen_pos(context.driver)
+    context.caret_screen_position_recorded = True
+
+
+def caret_screen_pos(context):
+    """
+    Gets the caret's screen position. If the previous step recorded it
+    with :func:`record_caret_screen_pos`, the recorded value is
+    returned. Otherwise, the position is queried from the browser.
+    """
+    if context.caret_screen_position_fresh:
+        return context.caret_screen_position
+
+    return wedutil.caret_screen_pos(context.driver)
+
+
+def find_cached_element(context, selector):
+    """
+    Finds an element by CSS selector, reusing the element found by an
+    earlier call with the same selector in the same scenario. The cache
+    is emptied whenever the editor is loaded.
+
+    Only use this for selectors that match elements which survive
+    redecoration, such as ``_real`` elements. Labels, for instance,
+    are recreated by wed and must not be looked up through this
+    function.
+    """
+    cache = context.element_cache
+    element = cache.get(selector)
+    if element is None:
+        element = cache[selector] = context.util.find_element(
+            (By.CSS_SELECTOR, selector))
+    return element
+
+
 def wait_for_editor(context, tooltips=False):
     util = context.util
     driver = context.driver
     builder = context.builder
     wedutil.wait_for_editor(util)
+    context.element_cache = {}
 
     context.origin_object = driver.execute_script("""
     var tooltips = arguments[0];
@@ -112,6 +518,56 @@ def wait_for_editor(context, tooltips=False):
         jQuery(".tooltip").remove();
     }
 
+    // Functions that steps call repeatedly while polling. Defining them
+    // once here saves sending their whole source with every poll.
+    window.__wedTestHelpers = {
+      teiHeaderFilled: function () {
+        var children = document.querySelectorAll("._real.teiHeader>._real");
+        if (!(children.length === 1 && children[0].matches(".fileDesc")))
+            return [false, "teiHeader contents"];
+
+        children = document.querySelectorAll("._real.fileDesc>._real");
+        if (!(children.length === 3 && children[0].matches(".titleStmt") &&
+              children[1].matches(".publicationStmt") &&
+              children[2].matches(".sourceDesc")))
+            return [false, "fileDesc contents"];
+
+
+        children = document.querySelectorAll("._real.titleStmt>._real");
+        if (!(children.length === 1 && children[0].matches(".title")))
+            return [false, "titleStmt contents"];
+
+
+        if (document.querySelector("._real.title>._real, " +
+                                   "._real.publicationStmt>._real, " +
+                                   "._real.sourceDesc>._real") !== null)
+            return [false, "contents of end elements"];
+
+        return [true, ""];
+      },
+
+      teiHeaderNotFilled: function () {
+        if (document.querySelector("._real.teiHeader>._real") !== null)
+            return [false, "contents of teiHeader"];
+
+        return [true, ""];
+      },
+
+      dataCaretPath: function () {
+        var caret = wed_editor.caretManager.getDataCaret();
+        return [wed_editor.dataUpdater.nodeToPath(caret.node), caret.offset];
+      },
+
+      textExcludingChildren: function (el) {
+        var text = "";
+        for (var child = el.firstChild; child; child = child.nextSibling) {
+          if (child.nodeType === Node.TEXT_NODE)
+            text += child.data;
+        }
+        return text;
+      }
+    };
+
     // This is bullshit to work around a Selenium limitation.
     jQuery("body").append(
         '<div id="origin-object" style=' +